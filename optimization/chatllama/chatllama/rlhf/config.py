@@ -18,6 +18,9 @@ class ConfigReward:
             to load / store finetuned model or checkpoints)
         model_head_hidden_size (int): Hidden size of the reward model head
         max_sequence_length (int): Max sequence length of the reward model
+        attn_implementation (Optional[str]): Attention implementation of the
+            HF model, e.g. "sdpa" or "flash_attention_2". Default to None,
+            which lets HF pick SDPA when the model supports it.
         train_dataset_path (Optional[str]): Path to the training dataset.
             Default to None. To be specified only for the reward model trainig.
         validation_dataset_path (Optional[str]): Path to the validation
@@ -29,6 +32,8 @@ class ConfigReward:
         epochs (Optional[int]): Number of epochs to train the reward model.
             Default to None. To be specified only for the reward model
             trainig.
+        num_workers (int): Number of dataloader workers used to prepare
+            the batches for the reward model training. Default to 4.
         iteration_per_print (Optional[int]): Number of iterations to print
             the training loss. Default to None. To be specified only for the
             reward model trainig.
@@ -53,6 +58,19 @@ class ConfigReward:
             Default to None.
         is_reward (bool): True if the model is a reward model. Default to True.
         accelerate_enable (bool): Enable accelerate for the reward model
+        compile_model (bool): Compile the reward model with torch.compile
+            during training. Ignored when deepspeed or accelerate are
+            enabled. Default to False.
+        compile_mode (str): Mode passed to torch.compile. Default to
+            "reduce-overhead".
+        gradient_checkpointing (bool): Enable gradient checkpointing for
+            the reward model training to allow larger batches. Default to
+            True.
+        bf16 (bool): Train the reward model with bfloat16 autocast. Ignored
+            when deepspeed or accelerate are enabled. Default to False.
+        fp16 (bool): Train the reward model with float16 autocast and loss
+            scaling. Ignored when deepspeed or accelerate are enabled.
+            Default to False.
         debug (bool): enable prints for Debugging
     """
 
@@ -61,10 +79,12 @@ class ConfigReward:
     model_folder: str
     model_head_hidden_size: int
     max_sequence_length: int
+    attn_implementation: Optional[str] = None
     train_dataset_path: Optional[str] = None
     validation_dataset_path: Optional[str] = None
     batch_size: Optional[int] = None
     epochs: Optional[int] = None
+    num_workers: int = 4
     iteration_per_print: Optional[int] = None
     checkpoint_steps: Optional[int] = None
     checkpoint_name: Optional[str] = None
@@ -79,6 +99,11 @@ class ConfigReward:
     # critic specific parameters
     is_reward: bool = True
     accelerate_enable: bool = False
+    compile_model: bool = False
+    compile_mode: str = "reduce-overhead"
+    gradient_checkpointing: bool = True
+    bf16: bool = False
+    fp16: bool = False
 
     debug: bool = False
 
@@ -1,14 +1,18 @@
-import json
+import itertools
+import math
 import shutil
 import os
 
 import deepspeed
+import numpy as np
+import orjson
 import torch
+import torch.nn.functional as F
 from accelerate import Accelerator
 from beartype import beartype
-from beartype.typing import Iterable, Tuple
+from beartype.typing import Iterable, List, Optional, Tuple
 from einops.layers.torch import Rearrange
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import Dataset, DataLoader, Sampler
 from transformers import (
     AutoModel,
     AutoTokenizer,
@@ -17,7 +21,7 @@ from transformers import (
 from chatllama.rlhf.config import ConfigReward
 from chatllama.rlhf.model_list import hf_models
 from chatllama.rlhf.model_loader import ModelLoader
-from chatllama.rlhf.utils import TrainingStats
+from chatllama.rlhf.utils import CudaPrefetcher, TrainingStats
 
 
 class RewardModel(torch.nn.Module):
@@ -37,6 +41,8 @@ class RewardModel(torch.nn.Module):
         save: Save the model
         load: Load the model
         get_reward: Get the reward for a given input (used by the reward model)
+        get_reward_fast: Get the reward for a given input applying the head
+            only on the last token (used by the reward training)
         parameters: Return the parameters of the reward model
 
     """
@@ -46,12 +52,21 @@ class RewardModel(torch.nn.Module):
 
         # store config
         self.config = config
+        self._debug = bool(config.debug)
 
         # initialize the self.model
         head_hidden_size = config.model_head_hidden_size
         if config.model in hf_models:
             self.tokenizer = self.load_tokenizer(config)
-            self.model = AutoModel.from_pretrained(config.model)
+            # by default HF picks SDPA for the models supporting it
+            model_kwargs = {}
+            if config.attn_implementation is not None:
+                model_kwargs["attn_implementation"] = (
+                    config.attn_implementation
+                )
+            self.model = AutoModel.from_pretrained(
+                config.model, **model_kwargs
+            )
             head_dim = self.model.config.hidden_size
             if config.model.startswith("gpt2"):
                 head_dim = self.model.config.n_embd
@@ -158,21 +173,50 @@ class RewardModel(torch.nn.Module):
         Returns:
             torch.Tensor: Rewards for the given output sequence
         """
+        rewards = self._forward_impl(output_sequence, output_sequence_mask)
+        self._print_debug("RewardModel.forward", output_sequence, rewards)
+        return rewards
+
+    def _print_debug(
+        self, name: str, output_sequence: torch.Tensor, rewards: torch.Tensor
+    ) -> None:
+        """Print the inputs and the rewards when debug is enabled"""
+        if self._debug and not torch.compiler.is_compiling():
+            print(name)
+            print("output_sequence.shape", output_sequence.shape)
+            print("output_sequence", output_sequence)
+            print("reward.shape", rewards.shape)
+            print("reward", rewards)
+
+    def _hidden_states(
+        self, output_sequence: torch.Tensor, output_sequence_mask: torch.Tensor
+    ) -> torch.Tensor:
+        """Last hidden states of the backbone model"""
         output = self.model(
             output_sequence, attention_mask=output_sequence_mask
         )
+        return output.last_hidden_state
 
+    def _forward_impl(
+        self, output_sequence: torch.Tensor, output_sequence_mask: torch.Tensor
+    ) -> torch.Tensor:
+        """Tensor-only part of the forward pass, without debug prints"""
         # What if the output_sequence is longer than the max context of
         # the model?
-        rewards = self.head(output.last_hidden_state)
-        if self.config.debug:
-            print("RewardModel.forward")
-            print("output_sequence.shape", output_sequence.shape)
-            print("output_sequence", output_sequence)
-            print("reward.shape", rewards.shape)
-            print("reward", rewards)
+        hidden_states = self._hidden_states(
+            output_sequence, output_sequence_mask
+        )
+        rewards = self.head(hidden_states)
         return rewards
 
+    def _check_sequence_length(self, output_sequence: torch.Tensor) -> None:
+        """Raise an error if the sequence exceeds max_sequence_length"""
+        if output_sequence.shape[1] > self.config.max_sequence_length:
+            raise ValueError(
+                f"Output sequence is too long: {output_sequence.shape[1]}"
+                f" > {self.config.max_sequence_length}"
+            )
+
     @beartype
     def get_reward(
         self, output_sequence: torch.Tensor, output_sequence_mask: torch.Tensor
@@ -184,14 +228,34 @@ class RewardModel(torch.nn.Module):
                 and actor output as tokens
             output_sequence_mask (torch.Tensor): Mask for the attention
         """
-        if output_sequence.shape[1] > self.config.max_sequence_length:
-            raise ValueError(
-                f"Output sequence is too long: {output_sequence.shape[1]}"
-                f" > {self.config.max_sequence_length}"
-            )
+        self._check_sequence_length(output_sequence)
         rewards = self.forward(output_sequence, output_sequence_mask)
         return rewards[:, -1]
 
+    @beartype
+    def get_reward_fast(
+        self, output_sequence: torch.Tensor, output_sequence_mask: torch.Tensor
+    ) -> torch.Tensor:
+        """Get the reward for the given output sequence applying the head
+        only on the hidden state of the last token of each sequence,
+        instead of computing the rewards for all the tokens as get_reward.
+
+        Args:
+            output_sequence (torch.Tensor): The concatenation of initial input
+                and actor output as tokens
+            output_sequence_mask (torch.Tensor): Mask for the attention
+        """
+        self._check_sequence_length(output_sequence)
+        hidden_states = self._hidden_states(
+            output_sequence, output_sequence_mask
+        )
+        # the tokenizer pads on the left, the last token is never padding
+        rewards = self.head(hidden_states[:, -1])
+        self._print_debug(
+            "RewardModel.get_reward_fast", output_sequence, rewards
+        )
+        return rewards
+
 
 # just to keep namings consistent
 CriticModel = RewardModel
@@ -214,27 +278,151 @@ class RewardDataset(Dataset):
         score: the score given by the user to the completion (or by the LLM)
     """
 
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, tokenizer, max_length: int) -> None:
         print(f"Loading dataset from {path}")
-        with open(path, "r") as f:
-            self.data = list(json.load(f))
-        print(f"Loaded {len(self.data)} samples")
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+        print(f"Loaded {len(data)} samples")
+
+        # tokenize the whole dataset once, padding is done per batch
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        texts = [d["user_input"] + d["completion"] for d in data]
+        scores = np.fromiter(
+            (float(d["score"]) if d["score"] else 2.5 for d in data),
+            dtype=np.float32,
+            count=len(data),
+        )
+        del data
+        encoded = tokenizer(
+            texts,
+            truncation=True,
+            max_length=max_length,
+            padding=False,
+            return_tensors=None,
+        )
+        self.input_ids = encoded["input_ids"]
+        self.lengths = [len(ids) for ids in self.input_ids]
+        self.scores = torch.from_numpy(scores)
 
     def __getitem__(self, idx: int):
-        user_input = self.data[idx]["user_input"]
-        completion = self.data[idx]["completion"]
-        if self.data[idx]["score"]:
-            score = float(self.data[idx]["score"])
-        else:
-            score = 2.5
-
-        item = (user_input + completion, score)
+        item = (self.input_ids[idx], self.scores[idx])
         return item
 
     def __len__(
         self,
     ):
-        return len(self.data)
+        return len(self.input_ids)
+
+    def collate_fn(self, batch):
+        """Pad the pre-tokenized samples to the longest sequence in the batch
+        rounded up to a multiple of 8 to match the tensor cores tiles.
+
+        Args:
+            batch (List[Tuple]): List of (input_ids, score) items
+
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor, torch.Tensor]: input_ids,
+                attention_mask and scores of the batch
+        """
+        input_ids = [item[0] for item in batch]
+        scores = torch.tensor(
+            [float(item[1]) for item in batch], dtype=torch.float32
+        )
+        # do not round up above the max sequence length of the model
+        pad_to_multiple_of = 8
+        longest = max(len(ids) for ids in input_ids)
+        padded_length = -(-longest // pad_to_multiple_of) * pad_to_multiple_of
+        if padded_length > self.max_length:
+            pad_to_multiple_of = None
+        input_tokens = self.tokenizer.pad(
+            {"input_ids": input_ids},
+            padding="longest",
+            pad_to_multiple_of=pad_to_multiple_of,
+            return_tensors="pt",
+        )
+        return (
+            input_tokens["input_ids"],
+            input_tokens["attention_mask"],
+            scores,
+        )
+
+
+class LengthBucketSampler(Sampler):
+    """Batch sampler grouping samples of similar length to reduce padding.
+    The indices are shuffled and split into buckets, each bucket is sorted
+    by length and split into batches, then the batches are shuffled.
+    The order depends only on seed and epoch, so that a training resumed
+    from a checkpoint sees the same batches.
+
+    Args:
+        lengths (List[int]): Length of each sample of the dataset
+        batch_size (int): Number of samples per batch
+        bucket_size (Optional[int]): Number of samples per bucket.
+            Default to 50 * batch_size.
+        shuffle (bool): Shuffle the samples and the batches. Default to
+            True.
+        seed (int): Seed used to shuffle the samples. Default to 0.
+
+    Methods:
+        set_epoch: Set the epoch used together with the seed to shuffle
+    """
+
+    def __init__(
+        self,
+        lengths: List[int],
+        batch_size: int,
+        bucket_size: Optional[int] = None,
+        shuffle: bool = True,
+        seed: int = 0,
+    ) -> None:
+        self.lengths = lengths
+        self.batch_size = batch_size
+        if bucket_size is None:
+            bucket_size = batch_size * 50
+        self.bucket_size = bucket_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int) -> None:
+        """Set the epoch to make the shuffling different at each epoch
+
+        Args:
+            epoch (int): Current epoch
+        """
+        self.epoch = epoch
+
+    def __iter__(self):
+        n_samples = len(self.lengths)
+        generator = torch.Generator()
+        generator.manual_seed(self.seed + self.epoch)
+        if self.shuffle:
+            indices = torch.randperm(n_samples, generator=generator).tolist()
+        else:
+            indices = list(range(n_samples))
+
+        # sort each bucket by length and split it in batches
+        batches = []
+        for start in range(0, n_samples, self.bucket_size):
+            bucket = sorted(
+                indices[start : start + self.bucket_size],
+                key=lambda idx: self.lengths[idx],
+            )
+            for i in range(0, len(bucket), self.batch_size):
+                batches.append(bucket[i : i + self.batch_size])
+
+        if self.shuffle:
+            order = torch.randperm(len(batches), generator=generator).tolist()
+            batches = [batches[i] for i in order]
+        return iter(batches)
+
+    def __len__(self):
+        n_samples = len(self.lengths)
+        n_full_buckets, remainder = divmod(n_samples, self.bucket_size)
+        return n_full_buckets * math.ceil(
+            self.bucket_size / self.batch_size
+        ) + math.ceil(remainder / self.batch_size)
 
 
 class RewardTrainer:
@@ -247,14 +435,19 @@ class RewardTrainer:
         model (RewardModel): Reward model
         config (ConfigModel): Config parameters for the model
         optimizer (torch.optim): Optimizer for the model
-        loss_function (torch.nn): Loss function for the model
         validation_flag (bool): Flag to indicate if the validation dataset
             is available
         train_dataset (RewardDataset): Dataset for training
+        train_sampler (LengthBucketSampler): Batch sampler for training
         validation_dataset (RewardDataset): Dataset for validation
         train_dataloader (DataLoader): Dataloader for training
         validation_dataloader (DataLoader): Dataloader for validation
         scheduler (torch.optim.lr_scheduler): Scheduler for the optimizer
+        n_iter (int): Number of training iterations per epoch
+        amp_dtype (Optional[torch.dtype]): Autocast dtype used for mixed
+            precision training, None if mixed precision is disabled
+        scaler (torch.amp.GradScaler): Loss scaler for fp16 training,
+            disabled for the other precisions
         training_stats (List[Dict]): List of dictionaries with the training
             statistics
         model_engine (ModelEngine): Model engine to train the model
@@ -277,35 +470,84 @@ class RewardTrainer:
         # load the model
         self.reward = RewardModel(config)
 
+        # recompute the activations in the backward pass to save memory
+        if config.gradient_checkpointing:
+            self.reward.model.gradient_checkpointing_enable()
+            self.reward.model.config.use_cache = False
+
+        # compile the backbone when its engine is not handled by
+        # deepspeed or accelerate. The module is compiled in place to
+        # keep the state_dict keys unchanged for checkpoints.
+        if (
+            config.compile_model
+            and not config.deepspeed_enable
+            and not config.accelerate_enable
+        ):
+            self.reward.model.compile(
+                mode=config.compile_mode,
+                dynamic=True,
+            )
+            print("Reward model compiled with torch.compile")
+
         # optimizer
         self.optimizer = torch.optim.AdamW(
             self.reward.parameters(), lr=config.lr
         )
 
-        # loss function
-        self.loss_function = torch.nn.MSELoss()
-
         # check validation dataset
         self.validation_flag = False
         if config.validation_dataset_path is not None:
             self.validation_flag = True
 
+        # dataloader workers tokenize and pad the batches in parallel
+        # with the GPU computation
+        num_workers = config.num_workers
+        dataloader_kwargs = {
+            "num_workers": num_workers,
+            "pin_memory": torch.device(config.device).type == "cuda",
+        }
+        if num_workers > 0:
+            dataloader_kwargs["persistent_workers"] = True
+            dataloader_kwargs["prefetch_factor"] = 4
+
         # create dataset and dataloaders
-        self.train_dataset = RewardDataset(config.train_dataset_path)
+        self.train_dataset = RewardDataset(
+            config.train_dataset_path,
+            self.reward.tokenizer,
+            config.max_sequence_length,
+        )
+        self.train_sampler = LengthBucketSampler(
+            self.train_dataset.lengths, config.batch_size
+        )
         self.train_dataloader = DataLoader(
-            self.train_dataset, batch_size=config.batch_size
+            self.train_dataset,
+            batch_sampler=self.train_sampler,
+            collate_fn=self.train_dataset.collate_fn,
+            **dataloader_kwargs,
         )
         if self.validation_flag:
-            self.eval_dataset = RewardDataset(config.validation_dataset_path)
+            self.eval_dataset = RewardDataset(
+                config.validation_dataset_path,
+                self.reward.tokenizer,
+                config.max_sequence_length,
+            )
             self.validation_dataloader = DataLoader(
-                self.eval_dataset, batch_size=config.batch_size
+                self.eval_dataset,
+                batch_size=config.batch_size,
+                collate_fn=self.eval_dataset.collate_fn,
+                **dataloader_kwargs,
             )
 
+        # number of iterations per epoch, including the last partial batch
+        self.n_iter = max(
+            1, math.ceil(len(self.train_dataset) / config.batch_size)
+        )
+
         # intilize scheduler - learning rate will drop to 10% of the initial
         # value
         self.scheduler = torch.optim.lr_scheduler.CosineAnnealingWarmRestarts(
             self.optimizer,
-            T_0=len(self.train_dataset) // config.batch_size,
+            T_0=self.n_iter,
             T_mult=1,
             eta_min=config.lr * 0.1,
             last_epoch=-1,
@@ -322,6 +564,24 @@ class RewardTrainer:
                 "Please choose one of them."
             )
 
+        # mixed precision, deepspeed and accelerate handle it on their own
+        if config.bf16 and config.fp16:
+            raise ValueError(
+                "Both bf16 and fp16 are enabled for the Reward. "
+                "Please choose one of them."
+            )
+        self.amp_dtype = None
+        if not config.deepspeed_enable and not config.accelerate_enable:
+            if config.bf16:
+                self.amp_dtype = torch.bfloat16
+            elif config.fp16:
+                self.amp_dtype = torch.float16
+        # loss scaling is needed only for fp16
+        self.scaler = torch.amp.GradScaler(
+            torch.device(config.device).type,
+            enabled=self.amp_dtype == torch.float16,
+        )
+
         # initialize deepspeed
         self.model_engine = None
         if config.deepspeed_enable is True:
@@ -345,6 +605,7 @@ class RewardTrainer:
                 model=self.reward,
                 model_parameters=self.reward.parameters(),
                 training_data=self.train_dataset,
+                collate_fn=self.train_dataset.collate_fn,
                 config=self.config.deepspeed_config_path,
             )
             print("Training with DeepSpeed")
@@ -418,6 +679,7 @@ class RewardTrainer:
                     "state_dict": self.reward.model.state_dict(),
                     "optim_state_dict": self.optimizer.state_dict(),
                     "scheduler_state_dict": self.scheduler.state_dict(),
+                    "scaler_state_dict": self.scaler.state_dict(),
                     "training_stats": self.training_stats,
                     "epoch": current_epoch,
                     "step": current_step,
@@ -482,6 +744,11 @@ class RewardTrainer:
                 self.scheduler.load_state_dict(
                     checkpoint["scheduler_state_dict"]
                 )
+                # checkpoints saved before mixed precision have no scaler
+                if "scaler_state_dict" in checkpoint:
+                    self.scaler.load_state_dict(
+                        checkpoint["scaler_state_dict"]
+                    )
                 self.training_stats = checkpoint["training_stats"]
                 step = checkpoint["step"]
             return epoch, step + 1  # return the next episode to train
@@ -494,17 +761,19 @@ class RewardTrainer:
         print("Start Training the Reward Model")
 
         # get config parameters
-        if self.config.deepspeed_enable:
-            batch_size = self.train_dataloader.batch_size
-        else:
-            batch_size = self.config.batch_size
         epochs = self.config.epochs
         device = self.config.device
         iteration_per_print = self.config.iteration_per_print
         checkpoint_steps = self.config.checkpoint_steps
+        amp_device_type = torch.device(device).type
 
-        # compute the number of iterations
-        n_iter = int(len(self.train_dataset) / batch_size)
+        # get the number of iterations, deepspeed uses the batch size
+        # of its own config
+        if self.config.deepspeed_enable:
+            batch_size = self.train_dataloader.batch_size
+            n_iter = max(1, math.ceil(len(self.train_dataset) / batch_size))
+        else:
+            n_iter = self.n_iter
 
         # load checkpoint
         start_epoch, start_step = self.load_checkpoint()
@@ -512,77 +781,99 @@ class RewardTrainer:
         # counter for the checkpoint
         cnt_checkpoints = 1
 
+        # bind the attributes used at every step to local variables
+        deepspeed_enable = self.config.deepspeed_enable
+        accelerate_enable = self.config.accelerate_enable
+        amp_dtype = self.amp_dtype
+        amp_enabled = amp_dtype is not None
+        optimizer = self.optimizer
+        scheduler = self.scheduler
+        scaler = self.scaler
+        model_engine = self.model_engine
+        reward = self.reward
+
         # traing loop
         for epoch in range(start_epoch, epochs):
-            self.reward.train()
-            for i, inputs in enumerate(self.train_dataloader):
-
-                # skip the steps if resuming from a checkpoint
-                if i < start_step:
-                    continue
-
-                # get the inputs
-                input_text = inputs[0]
-                score = inputs[1]
-
-                # tokenize the input
-                with torch.no_grad():
-                    input_tokens = self.reward.tokenizer(
-                        input_text,
-                        return_tensors="pt",
-                        truncation=True,
-                        padding=True,
-                    )
-                    output = torch.as_tensor(
-                        score, dtype=torch.float32, device=device
-                    )
-
-                # forward pass
-                if self.config.deepspeed_enable:
-                    est_output = self.model_engine(
-                        input_tokens["input_ids"].to(device),
-                        input_tokens["attention_mask"].to(device),
-                    )[:, -1]
-                else:
-                    est_output = self.reward.get_reward(
-                        input_tokens["input_ids"].to(device),
-                        input_tokens["attention_mask"].to(device),
-                    )
+            reward.train()
+            # same batch order when the epoch is resumed
+            self.train_sampler.set_epoch(epoch)
+
+            # accumulate the loss on the device to avoid a sync per step
+            loss_accum = torch.zeros((), device=device)
+            loss_count = 0
+            # skip the steps if resuming from a checkpoint, before the
+            # batches are copied to the device
+            train_batches = itertools.islice(
+                self.train_dataloader, start_step, None
+            )
+            for i, inputs in enumerate(
+                CudaPrefetcher(train_batches, device, 2), start=start_step
+            ):
+
+                # get the inputs, already on the device
+                input_ids, attention_mask, output = inputs
+
+                with torch.autocast(
+                    amp_device_type,
+                    dtype=amp_dtype,
+                    enabled=amp_enabled,
+                ):
+                    # forward pass
+                    if deepspeed_enable:
+                        est_output = model_engine(
+                            input_ids,
+                            attention_mask,
+                        )[:, -1]
+                    else:
+                        est_output = reward.get_reward_fast(
+                            input_ids,
+                            attention_mask,
+                        )
 
-                # compute the loss
-                loss = self.loss_function(est_output, output)
-                self.training_stats.training_loss.append(loss.item())
+                    # compute the loss
+                    loss = F.mse_loss(est_output, output)
+                loss_accum += loss.detach()
+                loss_count += 1
 
                 # backward pass
-                if self.config.deepspeed_enable:
-                    self.model_engine.backward(loss)
-                    self.model_engine.step()
-                elif self.config.accelerate_enable:
-                    self.optimizer.zero_grad()
+                if deepspeed_enable:
+                    model_engine.backward(loss)
+                    model_engine.step()
+                elif accelerate_enable:
+                    optimizer.zero_grad(set_to_none=True)
                     self.accelerator.backward(loss)
-                    self.optimizer.step()
-                    self.scheduler.step()
+                    optimizer.step()
+                    scheduler.step()
                 else:
-                    self.optimizer.zero_grad()
-                    loss.backward()
-                    self.optimizer.step()
-                    self.scheduler.step()
+                    optimizer.zero_grad(set_to_none=True)
+                    scaler.scale(loss).backward()
+                    scaler.step(optimizer)
+                    scaler.update()
+                    scheduler.step()
 
                 # print progress
                 if i % iteration_per_print == 0:
+                    mean_loss = (loss_accum / loss_count).item()
+                    loss_accum.zero_()
+                    loss_count = 0
+                    self.training_stats.training_loss.append(mean_loss)
                     print(
                         f"Epoch: {epoch+1}/{epochs}, "
                         f"Iteration: {i+1}/{n_iter}, "
-                        f"Training Loss: {loss.item()}"
+                        f"Training Loss: {mean_loss}"
+                    )
+                    printed_est_output = (
+                        (est_output.detach().float() * 10)
+                        .round()
+                        .div_(10)
+                        .cpu()
+                        .tolist()
                     )
-                    printed_est_output = [
-                        round(float(x), 1) for x in est_output.cpu().tolist()
-                    ]
                     print(
                         "prediction",
                         printed_est_output,
                         "target",
-                        score.cpu().tolist(),
+                        output.cpu().tolist(),
                     )
 
                 # checkpoints saving
@@ -592,33 +883,29 @@ class RewardTrainer:
                 else:
                     cnt_checkpoints += 1
 
+            # store the losses of the last partial print interval
+            if loss_count > 0:
+                mean_loss = (loss_accum / loss_count).item()
+                self.training_stats.training_loss.append(mean_loss)
+
             # Validation
             if self.validation_flag:
-                self.reward.eval()
-                with torch.no_grad():
-                    for i, (text, score) in enumerate(
-                        self.validation_dataloader
+                reward.eval()
+                with torch.inference_mode(), torch.autocast(
+                    amp_device_type, dtype=amp_dtype, enabled=amp_enabled
+                ):
+                    for i, (input_ids, attention_mask, output) in enumerate(
+                        CudaPrefetcher(self.validation_dataloader, device, 2)
                     ):
 
-                        # tokenize inputs
-                        input_tokens = self.reward.tokenizer(
-                            text, return_tensors="pt", padding=True
-                        )
-                        input_tokens = input_tokens.to(device)
-                        # TODO: check on the length of the input tokens if
-                        # they are too many it can create problems
-                        output = torch.tensor(score, dtype=torch.float32).to(
-                            device
-                        )
-
                         # forward pass
-                        est_output = self.reward.get_reward(
-                            input_tokens["input_ids"],
-                            input_tokens["attention_mask"],
+                        est_output = reward.get_reward_fast(
+                            input_ids,
+                            attention_mask,
                         )
 
                         # compute loss
-                        loss = self.loss_function(est_output, output)
+                        loss = F.mse_loss(est_output, output)
                         self.training_stats.validation_loss.append(loss.item())
 
                         # print progress
@@ -1,5 +1,8 @@
 import json
 import os
+from collections import deque
+
+import torch
 from beartype import beartype
 from plotly import graph_objects as go
 
@@ -104,6 +107,72 @@ class TrainingStats:
             os.remove(self.path)
 
 
+class CudaPrefetcher:
+    """Wrap a dataloader to copy the next batches to the device on a side
+    CUDA stream while the current batch is being processed.
+
+    Args:
+        loader (Iterable): Dataloader yielding tuples of tensors
+        device (torch.device): Device where the batches are moved
+        n (int): Number of batches copied ahead of the current one.
+            Default to 2.
+    """
+
+    def __init__(self, loader, device: torch.device, n: int = 2):
+        self.loader = loader
+        self.device = torch.device(device)
+        self.n = n
+
+    def __len__(self):
+        return len(self.loader)
+
+    def _to_device(self, batch):
+        return tuple(
+            x.to(self.device, non_blocking=True)
+            if isinstance(x, torch.Tensor)
+            else x
+            for x in batch
+        )
+
+    def __iter__(self):
+        iterator = iter(self.loader)
+
+        # without CUDA there is no copy to overlap
+        if self.device.type != "cuda":
+            for batch in iterator:
+                yield self._to_device(batch)
+            return
+
+        stream = torch.cuda.Stream(self.device)
+        queue = deque()
+
+        def preload():
+            batch = next(iterator, None)
+            if batch is None:
+                return
+            with torch.cuda.stream(stream):
+                batch = self._to_device(batch)
+                # mark the end of the copy of this batch only, so that the
+                # compute does not wait for the batches copied ahead
+                event = torch.cuda.Event()
+                event.record(stream)
+            queue.append((batch, event))
+
+        for _ in range(self.n):
+            preload()
+
+        while queue:
+            batch, event = queue.popleft()
+            current_stream = torch.cuda.current_stream(self.device)
+            current_stream.wait_event(event)
+            # the tensors were allocated on the side stream
+            for x in batch:
+                if isinstance(x, torch.Tensor):
+                    x.record_stream(current_stream)
+            preload()
+            yield batch
+
+
 class ConversationLog:
     """Save the conversation:
     (user input, model output, rewards and learn_counter)
@@ -9,7 +9,8 @@ REQUIREMENTS = [
     "einops",
     "fairscale",
     "langchain>=0.0.103",
-    "torch",
+    "orjson",
+    "torch>=2.3",
     "tqdm",
     "transformers",
     "datasets",